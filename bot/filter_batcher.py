@@ -0,0 +1,165 @@
+"""Micro-batching of concurrent classification requests into one LLM call."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BatchClassifier:
+    """
+    Coalesce messages arriving close together into a single OpenAI call.
+
+    When the target user posts a burst of messages, classifying each one
+    separately resends the full system prompt every time. The batcher
+    drains up to ``max_batch`` queued messages (waiting at most
+    ``max_wait`` seconds for stragglers) and asks the model to classify
+    the whole array at once, amortizing the prompt cost across the batch.
+    """
+
+    def __init__(self, max_batch: int = 8, max_wait: float = 0.3):
+        self._queue: asyncio.Queue[Tuple[str, asyncio.Future]] = asyncio.Queue()
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background drain task is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background drain task on the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._drain())
+            logger.info(
+                f"Batch classifier started (max_batch={self._max_batch}, "
+                f"max_wait={self._max_wait}s)"
+            )
+
+    async def stop(self) -> None:
+        """Stop the drain task without stranding pending callers.
+
+        The in-flight batch is shielded inside _drain and allowed to
+        finish; anything still queued afterwards is failed so handler
+        tasks blocked in submit() don't hang forever at shutdown
+        (classify() turns the exception into its usual error response).
+        """
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            stranded: List[Tuple[str, asyncio.Future]] = []
+            while True:
+                try:
+                    stranded.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            self._fail_pending(stranded)
+            if stranded:
+                logger.warning(
+                    f"Failed {len(stranded)} queued classifications at shutdown"
+                )
+            logger.info("Batch classifier stopped")
+
+    async def submit(self, text: str):
+        """
+        Queue a message for classification and wait for its verdict.
+
+        Args:
+            text: The message text to classify
+
+        Returns:
+            ModerationResponse for this message
+        """
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _drain(self) -> None:
+        """Collect queued messages into batches and classify them."""
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                # Grab whatever is already queued without waiting
+                while len(batch) < self._max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                # Only wait for stragglers when a burst is clearly in
+                # progress; a lone message proceeds immediately instead
+                # of paying max_wait
+                if 1 < len(batch) < self._max_batch:
+                    deadline = asyncio.get_running_loop().time() + self._max_wait
+                    while len(batch) < self._max_batch:
+                        remaining = deadline - asyncio.get_running_loop().time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            batch.append(
+                                await asyncio.wait_for(self._queue.get(), remaining)
+                            )
+                        except asyncio.TimeoutError:
+                            break
+            except asyncio.CancelledError:
+                # stop() interrupted collection; don't strand what we
+                # already pulled off the queue
+                self._fail_pending(batch)
+                raise
+            # Shield the classification so stop() cancelling this task
+            # still lets the in-flight batch resolve its futures
+            in_flight = asyncio.ensure_future(self._classify_batch(batch))
+            try:
+                await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                await in_flight
+                raise
+
+    @staticmethod
+    def _fail_pending(batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Fail every unresolved future so its submit() caller unblocks."""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(
+                    RuntimeError("Batch classifier stopped before classification")
+                )
+
+    async def _classify_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Classify a batch, falling back to per-message calls on failure."""
+        from bot.filters import _classify_batch_with_openai_async, _classify_with_openai_async
+
+        texts = [text for text, _ in batch]
+
+        if len(batch) > 1:
+            try:
+                results = await _classify_batch_with_openai_async(texts)
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+                return
+            except Exception as e:
+                logger.warning(
+                    f"Batch classification of {len(batch)} messages failed, "
+                    f"falling back to single calls: {e}"
+                )
+
+        # Single message, or batch call failed: classify each independently
+        for text, future in batch:
+            if future.done():
+                continue
+            try:
+                future.set_result(await _classify_with_openai_async(text))
+            except Exception as e:
+                future.set_exception(e)
+
+
+# Shared batcher instance; started from create_application() once the event
+# loop exists. classify() falls back to direct calls while it is stopped.
+batcher = BatchClassifier()
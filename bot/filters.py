@@ -2,26 +2,119 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
 import logging
+import re
 from typing import Dict, Optional
 
+import httpx
 import openai
-from openai import OpenAI
+import orjson
+from openai import AsyncOpenAI
 
 from config import config
+from bot.filters_cache import ModerationCache, profile_version
 
 logger = logging.getLogger(__name__)
 
+# High-precision whitelist for trivially-allowable logistics messages:
+# times, school/medical keywords, and short acknowledgements. Matching
+# messages skip the LLM entirely. Every token of the message must come
+# from this closed vocabulary of logistics keywords, neutral
+# connectives, or time forms ("3:30pm"), so one hostile word anywhere
+# falls through to the LLM ("You never show up for school pickup,
+# typical" does not match). Checked by splitting into tokens rather
+# than one fullmatch regex: an alternation of overlapping word and
+# digit tokens inside (...)+  backtracks catastrophically on inputs
+# like long digit runs, and this runs on the event loop.
+_FAST_TOKENS = frozenset({
+    "pickup", "dropoff", "drop", "off", "appointment", "fever", "homework",
+    "school", "practice",
+    "at", "is", "on", "for", "the", "a", "an", "to", "today", "tomorrow",
+    "this", "next", "week", "time", "what",
+    "ok", "okay", "yes", "no", "sure", "thanks",
+})
+_FAST_TIME = re.compile(r"\d{1,2}(:\d{2})?(am|pm)?")
+_FAST_SPLIT = re.compile(r"[\s,.?!-]+")
+
+
+def _fast_allow(text: str) -> bool:
+    """Whether every token of the message is in the logistics vocabulary."""
+    tokens = [t for t in _FAST_SPLIT.split(text.lower()) if t]
+    return bool(tokens) and all(
+        t in _FAST_TOKENS or _FAST_TIME.fullmatch(t) for t in tokens
+    )
+_SHORT_OK = frozenset({
+    "ok", "okay", "thanks", "thank you", "yes", "no", "sure", "got it",
+    "sounds good", "no problem",
+})
+
+# Structured-output schema: the API guarantees replies are valid JSON
+# matching ModerationResponse, so parse failures cannot occur
+_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "Moderation",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "allow": {"type": "boolean"},
+                "reason": {"type": "string"},
+                "category": {"type": "string"},
+            },
+            "required": ["allow", "reason", "category"],
+            "additionalProperties": False,
+        },
+        "strict": True,
+    },
+}
+
+# Detects the allow verdict in a partially-streamed JSON reply so blocked
+# vs allowed can be decided before the full response arrives
+_ALLOW_FIELD = re.compile(r'"allow"\s*:\s*(true|false)')
+
+# Moderation decisions that should never be cached (transient failures)
+_UNCACHEABLE_CATEGORIES = {"parsing_error", "error_permissive", "error_blocking"}
+
+# Backpressure for burst load: excess classifications queue here instead of
+# flooding the HTTP pool (PoolTimeout) or OpenAI's rate limiter (429 storms)
+_OPENAI_SEM = asyncio.Semaphore(config.OPENAI_MAX_CONCURRENCY)
+
+# Shared HTTP client so every OpenAI call reuses the same connection pool
+# instead of paying a fresh TLS handshake per request.
+_http: Optional[httpx.AsyncClient] = None
+
 # Initialize OpenAI client
-client: Optional[OpenAI] = None
+client: Optional[AsyncOpenAI] = None
 
 try:
-    client = OpenAI(api_key=config.OPENAI_API_KEY)
+    _http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=100,
+            keepalive_expiry=30.0,
+        ),
+        timeout=httpx.Timeout(15.0, connect=5.0),
+    )
+    # max_retries lets the SDK absorb transient 429/5xx/connection errors
+    # with its built-in exponential backoff before we ever see an exception
+    client = AsyncOpenAI(
+        api_key=config.OPENAI_API_KEY,
+        max_retries=3,
+        http_client=_http,
+    )
 except Exception as e:
     logger.error(f"Failed to initialize OpenAI client: {e}")
 
 
+async def aclose_http_client() -> None:
+    """Close the shared HTTP connection pool on shutdown."""
+    if _http:
+        await _http.aclose()
+
+
 class ModerationResponse:
     """Response from message classification with detailed reasoning."""
     
@@ -41,13 +134,11 @@ class ModerationResponse:
     def from_json(cls, json_str: str) -> "ModerationResponse":
         """Create ModerationResponse from JSON string."""
         try:
-            data = json.loads(json_str)
-            return cls(
-                allow=data.get("allow", False),
-                reason=data.get("reason", "No reason provided"),
-                category=data.get("category", "")
-            )
-        except (json.JSONDecodeError, KeyError) as e:
+            # allow/reason are schema-required, so index straight into the
+            # parsed dict; a missing key falls through to the block default
+            data = orjson.loads(json_str)
+            return cls(data["allow"], data["reason"], data.get("category", ""))
+        except (orjson.JSONDecodeError, KeyError, TypeError) as e:
             logger.warning(f"Failed to parse moderation response: {e}")
             # Default to blocking with generic message
             return cls(
@@ -57,8 +148,26 @@ class ModerationResponse:
             )
 
 
+# Content-addressable cache of previous decisions, keyed by message hash +
+# profile version so profile edits automatically invalidate old entries.
+# Constructed after ModerationResponse so loading a persisted cache during
+# module import can resolve the class.
+_cache = ModerationCache(path=config.MODERATION_CACHE_PATH or None)
+_profile_version = profile_version(config.get_moderation_profile())
+
+
+def save_cache() -> None:
+    """Persist cached moderation decisions on shutdown, if a path is set."""
+    _cache.save()
+
+
+@functools.lru_cache(maxsize=1)
 def _build_system_prompt() -> str:
-    """Build system prompt based on current moderation profile."""
+    """Build system prompt based on current moderation profile.
+
+    The profile is immutable for the process's lifetime, so the assembled
+    prompt is memoized and the string concatenation only runs once.
+    """
     profile = config.get_moderation_profile()
     
     base_prompt = """You are a co-parenting message moderator. Your job is to evaluate messages for appropriateness in a co-parenting logistics group.
@@ -68,13 +177,14 @@ CORE RULES:
 2. BE PERMISSIVE: When in doubt or if context is unclear, ALLOW the message
 3. Only BLOCK messages that are OBVIOUSLY inappropriate
 
-RESPONSE FORMAT: Return ONLY valid JSON in this exact format:
-{"allow": true/false, "reason": "specific explanation", "category": "reason_category"}
+Respond with a JSON object containing "allow", "reason", and "category".
 
 """
     
     if profile["behaviors"]:
-        behavior_text = "\n".join(f"- {behavior}" for behavior in profile["behaviors"])
+        # Sorted so the prompt is byte-identical across processes, keeping
+        # OpenAI's server-side prefix cache warm
+        behavior_text = "\n".join(f"- {behavior}" for behavior in sorted(profile["behaviors"]))
         
         profile_prompt = f"""
 MODERATION PROFILE: {profile["name"]}
@@ -92,31 +202,62 @@ Examples of targeted responses:
         base_prompt += profile_prompt
     
     base_prompt += """
-EXAMPLES:
-{"allow": true, "reason": "Legitimate scheduling discussion", "category": "scheduling"}
-{"allow": false, "reason": "This appears to be performative posturing rather than actionable co-parenting communication", "category": "performative"}
-{"allow": true, "reason": "Unclear context but potentially legitimate", "category": "permissive"}
-
 Remember: When message intent is unclear or ambiguous, ALWAYS err on the side of allowing it."""
-    
+
     return base_prompt
 
 
-def classify(text: str) -> ModerationResponse:
+# Worked examples as few-shot turns rather than prompt text; sent verbatim
+# after the system message so the shared prefix stays cacheable
+_FEW_SHOT_MESSAGES = (
+    {"role": "user", "content": "Evaluate this message: Can we move Saturday pickup to 3pm?"},
+    {"role": "assistant", "content": '{"allow": true, "reason": "Legitimate scheduling discussion", "category": "scheduling"}'},
+    {"role": "user", "content": "Evaluate this message: I have always been the only one who truly cares about these kids, unlike some people."},
+    {"role": "assistant", "content": '{"allow": false, "reason": "This appears to be performative posturing rather than actionable co-parenting communication", "category": "performative"}'},
+)
+
+
+async def classify(text: str) -> ModerationResponse:
     """
     Classify a message with detailed reasoning.
-    
+
     This function serves as the main interface for message classification.
     To swap in a different LLM provider, modify this function only.
-    
+
     Args:
         text: The message text to classify
-        
+
     Returns:
         ModerationResponse with allow/block decision and specific reasoning
     """
+    # Fast path: obviously-allowable logistics text never needs the LLM
+    stripped = text.strip()
+    if stripped.lower() in _SHORT_OK or (
+        len(stripped) < 60 and _fast_allow(stripped)
+    ):
+        return ModerationResponse(
+            allow=True,
+            reason="Matched logistics fast-path whitelist",
+            category="fastpath_logistics"
+        )
+
+    cache_key = ModerationCache.key_for(text, _profile_version)
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Cache hit for message hash {cache_key[:12]}")
+        return cached
+
+    # Imported here to avoid a circular import at module load
+    from bot.filter_batcher import batcher
+
     try:
-        return _classify_with_openai(text)
+        if batcher.running:
+            result = await batcher.submit(text)
+        else:
+            result = await _classify_with_openai_async(text)
+        if result.category not in _UNCACHEABLE_CATEGORIES:
+            _cache.put(cache_key, result)
+        return result
     except Exception as e:
         logger.error(f"Classification failed for text '{text[:50]}...': {e}")
         # Default to allowing on error in permissive mode
@@ -135,70 +276,164 @@ def classify(text: str) -> ModerationResponse:
             )
 
 
-def _classify_with_openai(text: str) -> ModerationResponse:
+async def _classify_with_openai_async(text: str) -> ModerationResponse:
     """
     Classify message using OpenAI GPT-4o with detailed response.
-    
+
+    Runs on the shared async client so the event loop stays free to handle
+    other Telegram updates while the API round trip is in flight.
+
     Args:
         text: The message text to classify
-        
+
     Returns:
         ModerationResponse with detailed reasoning
-        
+
     Raises:
         RuntimeError: If OpenAI API call fails
     """
     if not client:
         raise RuntimeError("OpenAI client not initialized")
-    
+
     try:
         system_prompt = _build_system_prompt()
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Evaluate this message: {text}"}
-            ],
-            max_tokens=150,  # Increased for detailed responses
-            temperature=0.1,  # Low but not zero for some variation
-            timeout=15.0  # Increased timeout for more complex processing
-        )
-        
-        result = response.choices[0].message.content.strip()
-        
-        # Try to parse as JSON response
-        return ModerationResponse.from_json(result)
-            
-    except openai.RateLimitError:
-        logger.error("OpenAI rate limit exceeded")
-        raise RuntimeError("AI service temporarily unavailable (rate limit)")
-    except openai.APIConnectionError:
-        logger.error("OpenAI API connection failed")
-        raise RuntimeError("AI service connection failed")
-    except openai.APITimeoutError:
-        logger.error("OpenAI API timeout")
-        raise RuntimeError("AI service timeout")
+
+        # The semaphore spans the whole stream so a held connection counts
+        # against the concurrency budget until it is drained
+        async with _OPENAI_SEM:
+            stream = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    *_FEW_SHOT_MESSAGES,
+                    {"role": "user", "content": f"Evaluate this message: {text}"}
+                ],
+                response_format=_RESPONSE_FORMAT,
+                max_tokens=64,  # Verdict + short reason + category fit comfortably
+                temperature=0.1,  # Low but not zero for some variation
+                timeout=15.0,  # Increased timeout for more complex processing
+                stream=True,  # Decide on the allow field before generation finishes
+            )
+
+            parts: list[str] = []
+            allow_seen: Optional[bool] = None
+            async with stream:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    parts.append(delta)
+                    if allow_seen is None:
+                        match = _ALLOW_FIELD.search("".join(parts))
+                        if match:
+                            allow_seen = match.group(1) == "true"
+                            if allow_seen:
+                                # Allowed messages don't need the reason text;
+                                # stop reading (and generating) early
+                                break
+
+        result = ModerationResponse.from_json("".join(parts).strip())
+        if result.category == "parsing_error" and allow_seen:
+            # Truncated by the early break above, but the verdict is known
+            return ModerationResponse(
+                allow=True,
+                reason="Allowed on early streamed verdict",
+                category="streamed_allow"
+            )
+        return result
+
+    except openai.OpenAIError as e:
+        # The SDK has already retried transient 429/5xx/connection failures
+        # with exponential backoff; anything surfacing here is exhausted
+        logger.error(f"OpenAI API error after retries: {e}")
+        raise RuntimeError(f"AI service unavailable after retries: {e}")
     except Exception as e:
         logger.error(f"OpenAI API error: {e}")
         raise RuntimeError(f"AI service error: {e}")
 
 
-# Alternative implementation examples for different providers:
+async def _classify_batch_with_openai_async(texts: list[str]) -> list[ModerationResponse]:
+    """
+    Classify several messages in one OpenAI call with a JSON-array reply.
+
+    Sends the system prompt once for the whole batch instead of once per
+    message. The model is asked to return one verdict object per input, in
+    order.
+
+    Args:
+        texts: The message texts to classify
+
+    Returns:
+        One ModerationResponse per input text, in the same order
 
-def _classify_with_http_api(text: str, api_url: str, api_key: str) -> ModerationResponse:
+    Raises:
+        RuntimeError: If the OpenAI API call fails or the reply does not
+            contain exactly one verdict per message
+    """
+    if not client:
+        raise RuntimeError("OpenAI client not initialized")
+
+    numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(texts, start=1))
+    user_prompt = (
+        f"Evaluate these {len(texts)} messages independently and return ONLY a "
+        f"JSON array with one verdict object per message, in order:\n{numbered}"
+    )
+
+    try:
+        async with _OPENAI_SEM:
+            response = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": _build_system_prompt()},
+                    {"role": "user", "content": user_prompt}
+                ],
+                max_tokens=64 * len(texts),
+                temperature=0.1,
+                timeout=15.0
+            )
+
+        result = response.choices[0].message.content.strip()
+        verdicts = orjson.loads(result)
+    except orjson.JSONDecodeError as e:
+        raise RuntimeError(f"Batch response was not valid JSON: {e}")
+    except Exception as e:
+        logger.error(f"OpenAI batch API error: {e}")
+        raise RuntimeError(f"AI service error: {e}")
+
+    if not isinstance(verdicts, list) or len(verdicts) != len(texts):
+        raise RuntimeError(
+            f"Batch response had {len(verdicts) if isinstance(verdicts, list) else 'no'} "
+            f"verdicts for {len(texts)} messages"
+        )
+
+    return [
+        ModerationResponse(
+            allow=verdict.get("allow", False),
+            reason=verdict.get("reason", "No reason provided"),
+            category=verdict.get("category", "")
+        )
+        for verdict in verdicts
+    ]
+
+
+# Alternative implementation examples for different providers. All providers
+# must be async: a synchronous HTTP library here would block the event loop
+# for every classification.
+
+async def _classify_with_http_api(text: str, api_url: str, api_key: str) -> ModerationResponse:
     """
     Example implementation for generic HTTP API providers.
-    
+
     To use this instead of OpenAI, replace the classify() function body with:
-    return _classify_with_http_api(text, "https://api.provider.com/classify", "your_key")
+    return await _classify_with_http_api(text, "https://api.provider.com/classify", "your_key")
     """
-    import requests
-    
+    if not _http:
+        raise RuntimeError("HTTP client not initialized")
+
     try:
         system_prompt = _build_system_prompt()
-        
-        response = requests.post(
+
+        response = await _http.post(
             api_url,
             json={
                 "text": text,
@@ -211,31 +446,32 @@ def _classify_with_http_api(text: str, api_url: str, api_key: str) -> Moderation
             },
             timeout=15.0
         )
-        
+
         response.raise_for_status()
         result = response.json()
-        
+
         # Expect the API to return JSON in our format
-        return ModerationResponse.from_json(json.dumps(result))
-        
-    except requests.exceptions.RequestException as e:
+        return ModerationResponse.from_json(orjson.dumps(result).decode())
+
+    except httpx.HTTPError as e:
         logger.error(f"HTTP API error: {e}")
         raise RuntimeError(f"AI service error: {e}")
 
 
-def _classify_with_together_ai(text: str, api_key: str) -> ModerationResponse:
+async def _classify_with_together_ai(text: str, api_key: str) -> ModerationResponse:
     """
     Example implementation for Together AI with JSON response parsing.
-    
+
     Replace classify() function body with:
-    return _classify_with_together_ai(text, config.TOGETHER_API_KEY)
+    return await _classify_with_together_ai(text, config.TOGETHER_API_KEY)
     """
-    import requests
-    
+    if not _http:
+        raise RuntimeError("HTTP client not initialized")
+
     try:
         system_prompt = _build_system_prompt()
-        
-        response = requests.post(
+
+        response = await _http.post(
             "https://api.together.xyz/inference",
             json={
                 "model": "meta-llama/Llama-2-70b-chat-hf",  # Larger model for better JSON
@@ -250,13 +486,13 @@ def _classify_with_together_ai(text: str, api_key: str) -> ModerationResponse:
             },
             timeout=15.0
         )
-        
+
         response.raise_for_status()
         result = response.json()
-        
+
         output = result["output"]["choices"][0]["text"].strip()
         return ModerationResponse.from_json(output)
-        
-    except requests.exceptions.RequestException as e:
+
+    except httpx.HTTPError as e:
         logger.error(f"Together AI error: {e}")
-        raise RuntimeError(f"AI service error: {e}") 
\ No newline at end of file
+        raise RuntimeError(f"AI service error: {e}")
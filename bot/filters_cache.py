@@ -0,0 +1,114 @@
+"""Content-addressable cache for moderation decisions."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bot.filters import ModerationResponse
+
+logger = logging.getLogger(__name__)
+
+
+def profile_version(profile: dict) -> str:
+    """
+    Compute a stable version hash for a moderation profile.
+
+    Keyed on the profile name and its sorted behavior list so that any edit
+    to the profile automatically invalidates previously cached decisions.
+
+    Args:
+        profile: A moderation profile dict from config
+
+    Returns:
+        Hex digest identifying this profile revision
+    """
+    fingerprint = profile.get("name", "") + "|".join(sorted(profile.get("behaviors", [])))
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+class ModerationCache:
+    """
+    LRU cache of moderation decisions keyed by message-content hash.
+
+    Repeated text ("ok", "thanks", recurring scheduling boilerplate) is
+    answered from memory instead of triggering another LLM round trip.
+    Optionally persists to a JSON file so decisions survive restarts.
+    """
+
+    def __init__(self, max_entries: int = 4096, path: Optional[str] = None):
+        self._entries: OrderedDict[str, "ModerationResponse"] = OrderedDict()
+        self._max_entries = max_entries
+        self._path = path
+        if path:
+            self._load()
+
+    @staticmethod
+    def key_for(text: str, version: str) -> str:
+        """Build the cache key for a message under a given profile version."""
+        return hashlib.sha256((text + version).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional["ModerationResponse"]:
+        """Return the cached response for a key, or None on miss."""
+        response = self._entries.get(key)
+        if response is not None:
+            # Refresh LRU position on hit
+            self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, response: "ModerationResponse") -> None:
+        """Store a response, evicting the least-recently-used entry if full.
+
+        Persistence is deliberately not done here: put() runs on the async
+        classification hot path, and serializing the whole cache per message
+        would block the event loop. Call save() at shutdown instead.
+        """
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """Persist all entries to disk if a path was configured."""
+        if self._path:
+            self._save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """Load persisted entries from disk, ignoring a missing or bad file."""
+        from bot.filters import ModerationResponse
+
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable moderation cache {self._path}: {e}")
+            return
+
+        for key, entry in data.items():
+            self._entries[key] = ModerationResponse(
+                allow=entry.get("allow", False),
+                reason=entry.get("reason", ""),
+                category=entry.get("category", ""),
+            )
+        logger.info(f"Loaded {len(self._entries)} cached moderation decisions")
+
+    def _save(self) -> None:
+        """Atomically persist entries to disk (write to tmp, then replace)."""
+        tmp_path = f"{self._path}.tmp"
+        try:
+            data = {key: response.to_dict() for key, response in self._entries.items()}
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.warning(f"Failed to persist moderation cache to {self._path}: {e}")
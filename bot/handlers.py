@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime
 from typing import Optional
 
 from telegram import Bot, Message, Update
@@ -14,6 +14,71 @@ from bot.filters import classify, ModerationResponse
 
 logger = logging.getLogger(__name__)
 
+# Both the target username and the moderation profile are fixed for the
+# process's lifetime, so resolve them once instead of per update
+_TARGET_USERNAME_LOWER = config.get_target_username_normalized().lower()
+_PROFILE = config.get_moderation_profile()
+
+_BASE_WARNING = "This group is for co-parenting logistics only (health, education, scheduling, logistics)."
+
+# Map categories to more user-friendly explanations
+_CATEGORY_MESSAGES: dict[str, str] = {
+    "performative": "Your message appeared to be performative posturing rather than actionable co-parenting communication.",
+    "manipulation": "Your message seemed to deflect from logistics to emotional manipulation.",
+    "narrative": "Your message appeared to craft a narrative rather than address children's needs.",
+    "grandstanding": "Your message seemed to be grandstanding without substance about children's welfare.",
+    "off_topic": "Your message was off-topic for this co-parenting logistics group.",
+    "emotional_pressure": "Your message used emotional pressure instead of focusing on factual logistics.",
+    "deflection": "Your message deflected from actual logistics to other topics.",
+}
+
+# AI reasons too generic to show; replaced by the category mapping above
+_GENERIC_REASONS: frozenset[str] = frozenset({
+    "No reason provided",
+    "Message could not be properly evaluated",
+})
+
+# Command replies are constant at runtime (profile and target never change),
+# so build them once at import instead of per command
+_START_TEXT = (
+    "🤖 Co-Parent Filter Bot is running!\n\n"
+    f"📍 Monitoring messages from: @{config.get_target_username_normalized()}\n"
+    f"🎯 Moderation Profile: {_PROFILE['name']}\n"
+    f"📋 Filtering for co-parenting topics: health, education, scheduling, logistics\n"
+    f"🔍 Mode: {'Permissive (only blocks obviously problematic content)' if _PROFILE.get('permissive_mode') else 'Strict'}\n\n"
+    "Bot is ready and actively monitoring with detailed feedback."
+)
+
+# Only the bot and chat IDs vary per invocation
+_STATUS_TEMPLATE = (
+    "📊 Bot Status:\n"
+    f"✅ Active and monitoring @{config.get_target_username_normalized()}\n"
+    f"🎯 Profile: {_PROFILE['name']}\n"
+    f"🔍 Filtering: health, education, scheduling, logistics\n"
+    f"🤖 AI Model: GPT-4o with detailed reasoning\n"
+    f"⚙️ Mode: {'Permissive' if _PROFILE.get('permissive_mode') else 'Strict'}\n"
+    "🆔 Bot ID: %s\n"
+    "💬 Chat ID: %s"
+)
+
+
+def _build_profile_text() -> str:
+    """Assemble the /profile reply once at import time."""
+    profile_info = (
+        f"🎯 Current Moderation Profile: {_PROFILE['name']}\n\n"
+        f"📝 Description: {_PROFILE['description']}\n\n"
+    )
+
+    if _PROFILE['behaviors']:
+        behaviors_text = "\n".join(f"• {behavior}" for behavior in _PROFILE['behaviors'])
+        profile_info += f"🔍 Watching for these patterns:\n{behaviors_text}\n\n"
+
+    profile_info += f"⚙️ Mode: {'Permissive (only blocks obvious violations)' if _PROFILE.get('permissive_mode') else 'Strict (blocks any violations)'}"
+    return profile_info
+
+
+_PROFILE_TEXT = _build_profile_text()
+
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -28,50 +93,47 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     message = update.message
     username = message.from_user.username if message.from_user else None
-    target_username = config.get_target_username_normalized()
-    
+
     # Only monitor messages from the target username
-    if not username or username.lower() != target_username.lower():
+    if not username or username.lower() != _TARGET_USERNAME_LOWER:
         return
     
     text = message.text.strip()
     if not text:
         return
     
-    # Log the message being processed
-    timestamp = datetime.now().isoformat()
-    logger.info(f"Processing message from @{username} at {timestamp}")
-    
+    # Log the message being processed; timestamps come from the formatter
+    logger.info("Processing message from @%s", username)
+
     try:
         # Classify the message using AI
-        moderation_result = classify(text)
-        
-        # Log the decision with detailed information
-        preview = text[:50] + "..." if len(text) > 50 else text
-        
-        log_message = (
-            f"[{timestamp}] @{username}: '{preview}' -> "
-            f"{'ALLOW' if moderation_result.allow else 'BLOCK'} "
-            f"({moderation_result.category}): {moderation_result.reason}"
-        )
-        
+        moderation_result = await classify(text)
+
+        # Log the decision with detailed information; an empty slice is falsy,
+        # so this branches without a separate len() call
+        preview = text[:50] + "..." if text[50:51] else text
+
         if moderation_result.allow:
-            logger.info(f"ALLOWED: {log_message}")
-            print(f"✅ ALLOWED: {log_message}")
+            logger.info(
+                "ALLOWED: @%s: '%s' (%s): %s",
+                username, preview,
+                moderation_result.category, moderation_result.reason,
+            )
         else:
-            logger.warning(f"BLOCKED: {log_message}")
-            print(f"❌ BLOCKED: {log_message}")
-            
+            logger.warning(
+                "BLOCKED: @%s: '%s' (%s): %s",
+                username, preview,
+                moderation_result.category, moderation_result.reason,
+            )
+
             # Delete the message and send specific warning
             await _delete_message_and_warn(message, context.bot, moderation_result)
-            
+
     except Exception as e:
-        logger.error(f"Error processing message from @{username}: {e}")
         # Log the error but don't crash the bot
-        error_log = (
-            f"[{timestamp}] @{username}: '{text[:50]}...' -> ERROR: {e}"
+        logger.error(
+            "Error processing message from @%s: '%s' -> %s", username, text[:50], e
         )
-        print(f"⚠️ ERROR: {error_log}")
 
 
 async def _delete_message_and_warn(message: Message, bot: Bot, moderation_result: ModerationResponse) -> None:
@@ -83,29 +145,36 @@ async def _delete_message_and_warn(message: Message, bot: Bot, moderation_result
         bot: Bot instance for sending messages
         moderation_result: The detailed moderation response with reasoning
     """
-    try:
-        # Delete the original message
-        await bot.delete_message(
+    # Create targeted warning message
+    warning_text = _build_warning_message(moderation_result)
+
+    # Fire both Telegram calls concurrently so their round trips overlap;
+    # the offending message disappears as fast as the API allows
+    delete_result, send_result = await asyncio.gather(
+        bot.delete_message(
             chat_id=message.chat_id,
             message_id=message.message_id
-        )
-        logger.info(f"Deleted message {message.message_id} from chat {message.chat_id}")
-        
-        # Create targeted warning message
-        warning_text = _build_warning_message(moderation_result)
-        
-        # Send specific warning to the user
-        warning_msg = await bot.send_message(
+        ),
+        bot.send_message(
             chat_id=message.chat_id,
             text=warning_text,
             reply_to_message_id=None  # Don't reply to deleted message
+        ),
+        return_exceptions=True,  # Don't let one failure crash the bot
+    )
+
+    if isinstance(delete_result, BaseException):
+        logger.error("Failed to delete message %s: %s", message.message_id, delete_result)
+    else:
+        logger.info("Deleted message %s from chat %s", message.message_id, message.chat_id)
+
+    if isinstance(send_result, BaseException):
+        logger.error("Failed to send warning message: %s", send_result)
+    else:
+        logger.info(
+            "Sent targeted warning message %s: %s",
+            send_result.message_id, moderation_result.reason,
         )
-        
-        logger.info(f"Sent targeted warning message {warning_msg.message_id}: {moderation_result.reason}")
-        
-    except Exception as e:
-        logger.error(f"Failed to delete message or send warning: {e}")
-        # Don't raise the exception to avoid crashing the bot
 
 
 def _build_warning_message(moderation_result: ModerationResponse) -> str:
@@ -118,28 +187,15 @@ def _build_warning_message(moderation_result: ModerationResponse) -> str:
     Returns:
         Formatted warning message
     """
-    base_message = "This group is for co-parenting logistics only (health, education, scheduling, logistics)."
-    
-    # Map categories to more user-friendly explanations
-    category_messages = {
-        "performative": "Your message appeared to be performative posturing rather than actionable co-parenting communication.",
-        "manipulation": "Your message seemed to deflect from logistics to emotional manipulation.",
-        "narrative": "Your message appeared to craft a narrative rather than address children's needs.",
-        "grandstanding": "Your message seemed to be grandstanding without substance about children's welfare.",
-        "off_topic": "Your message was off-topic for this co-parenting logistics group.",
-        "emotional_pressure": "Your message used emotional pressure instead of focusing on factual logistics.",
-        "deflection": "Your message deflected from actual logistics to other topics.",
-    }
-    
     # Use the specific reason from AI, or fall back to category mapping
     specific_reason = moderation_result.reason
-    
+
     # If the AI reason is generic, try to use category-specific messaging
-    if (specific_reason in ["No reason provided", "Message could not be properly evaluated"] 
-        and moderation_result.category in category_messages):
-        specific_reason = category_messages[moderation_result.category]
-    
-    return f"{base_message} {specific_reason}"
+    if (specific_reason in _GENERIC_REASONS
+        and moderation_result.category in _CATEGORY_MESSAGES):
+        specific_reason = _CATEGORY_MESSAGES[moderation_result.category]
+
+    return f"{_BASE_WARNING} {specific_reason}"
 
 
 async def handle_error(update: Optional[Update], context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -151,15 +207,13 @@ async def handle_error(update: Optional[Update], context: ContextTypes.DEFAULT_T
         context: Bot context containing error information
     """
     error = context.error
-    logger.error(f"Update {update} caused error: {error}")
-    
+    logger.error("Update %s caused error: %s", update, error)
+
     # Log additional context if available
     if update and update.message:
         username = update.message.from_user.username if update.message.from_user else "unknown"
         text_preview = update.message.text[:50] if update.message.text else "no text"
-        logger.error(f"Error context - User: @{username}, Text: '{text_preview}...'")
-    
-    print(f"🚨 Bot error: {error}")
+        logger.error("Error context - User: @%s, Text: '%s...'", username, text_preview)
 
 
 async def handle_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -172,19 +226,8 @@ async def handle_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     """
     if not update.message:
         return
-    
-    profile = config.get_moderation_profile()
-    
-    response = (
-        "🤖 Co-Parent Filter Bot is running!\n\n"
-        f"📍 Monitoring messages from: @{config.get_target_username_normalized()}\n"
-        f"🎯 Moderation Profile: {profile['name']}\n"
-        f"📋 Filtering for co-parenting topics: health, education, scheduling, logistics\n"
-        f"🔍 Mode: {'Permissive (only blocks obviously problematic content)' if profile.get('permissive_mode') else 'Strict'}\n\n"
-        "Bot is ready and actively monitoring with detailed feedback."
-    )
-    
-    await update.message.reply_text(response)
+
+    await update.message.reply_text(_START_TEXT)
     logger.info("Bot start command received")
 
 
@@ -198,23 +241,13 @@ async def handle_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     """
     if not update.message:
         return
-    
-    profile = config.get_moderation_profile()
+
     user_id = update.message.from_user.id if update.message.from_user else None
-    
-    status = (
-        "📊 Bot Status:\n"
-        f"✅ Active and monitoring @{config.get_target_username_normalized()}\n"
-        f"🎯 Profile: {profile['name']}\n"
-        f"🔍 Filtering: health, education, scheduling, logistics\n"
-        f"🤖 AI Model: GPT-4o with detailed reasoning\n"
-        f"⚙️ Mode: {'Permissive' if profile.get('permissive_mode') else 'Strict'}\n"
-        f"🆔 Bot ID: {context.bot.id}\n"
-        f"💬 Chat ID: {update.message.chat_id}"
+
+    await update.message.reply_text(
+        _STATUS_TEMPLATE % (context.bot.id, update.message.chat_id)
     )
-    
-    await update.message.reply_text(status)
-    logger.info(f"Status requested by user {user_id}")
+    logger.info("Status requested by user %s", user_id)
 
 
 async def handle_profile(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -227,21 +260,8 @@ async def handle_profile(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     """
     if not update.message:
         return
-    
-    profile = config.get_moderation_profile()
-    
-    profile_info = (
-        f"🎯 Current Moderation Profile: {profile['name']}\n\n"
-        f"📝 Description: {profile['description']}\n\n"
-    )
-    
-    if profile['behaviors']:
-        behaviors_text = "\n".join(f"• {behavior}" for behavior in profile['behaviors'])
-        profile_info += f"🔍 Watching for these patterns:\n{behaviors_text}\n\n"
-    
-    profile_info += f"⚙️ Mode: {'Permissive (only blocks obvious violations)' if profile.get('permissive_mode') else 'Strict (blocks any violations)'}"
-    
-    await update.message.reply_text(profile_info)
+
+    await update.message.reply_text(_PROFILE_TEXT)
     logger.info("Profile info requested")
 
 
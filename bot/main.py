@@ -8,6 +8,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import asyncio
 import logging
 import logging.config
+import logging.handlers
+import queue
 import signal
 import sys
 from pathlib import Path
@@ -16,6 +18,8 @@ from typing import NoReturn
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
 
 from config import config
+from bot.filter_batcher import batcher
+from bot.filters import aclose_http_client, save_cache
 from bot.handlers import (
     COMMAND_HANDLERS,
     handle_error,
@@ -25,11 +29,19 @@ from bot.handlers import (
 # Global application instance for graceful shutdown
 app: Application | None = None
 
+# Set by the signal handler; main() idles on it instead of polling
+_shutdown = asyncio.Event()
+
+# Background listener that drains queued log records off the event loop
+log_listener: logging.handlers.QueueListener | None = None
+
 
 def setup_logging() -> None:
     """Configure logging for the application."""
+    global log_listener
+
     logging_config_path = Path(__file__).parent / "logging.cfg"
-    
+
     if logging_config_path.exists():
         logging.config.fileConfig(logging_config_path)
     else:
@@ -39,26 +51,61 @@ def setup_logging() -> None:
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
-    
+
+    # Route records through a queue so handler I/O (stdout/file writes)
+    # happens on a background thread instead of blocking the event loop.
+    # logging.cfg gives "bot" and "telegram" their own handlers with
+    # propagate=0, so rewiring only the root logger would leave the
+    # per-message hot path writing synchronously; swap every configured
+    # logger's handlers for the shared QueueHandler.
+    loggers = [logging.getLogger()]
+    for name in list(logging.root.manager.loggerDict):
+        candidate = logging.getLogger(name)
+        if isinstance(candidate, logging.Logger) and candidate.handlers:
+            loggers.append(candidate)
+
+    sinks: list[logging.Handler] = []
+    for target in loggers:
+        for handler in target.handlers:
+            if handler not in sinks:
+                sinks.append(handler)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    log_listener = logging.handlers.QueueListener(
+        log_queue, *sinks, respect_handler_level=True
+    )
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    for target in loggers:
+        target.handlers = [queue_handler]
+    log_listener.start()
+
     logger = logging.getLogger(__name__)
     logger.info("Logging configured successfully")
 
 
 def setup_signal_handlers() -> None:
-    """Setup signal handlers for graceful shutdown."""
-    def signal_handler(sig: int, frame) -> None:
+    """Setup signal handlers for graceful shutdown.
+
+    Must be called from within the running event loop. Uses
+    loop.add_signal_handler so the callback runs on the loop thread,
+    avoiding the races of scheduling tasks from raw OS signal context.
+    """
+    loop = asyncio.get_running_loop()
+
+    def request_shutdown(sig: int) -> None:
         logger = logging.getLogger(__name__)
         logger.info(f"Received signal {sig}, shutting down gracefully...")
-        
-        if app:
-            # Stop the application
-            asyncio.create_task(app.stop())
-            asyncio.create_task(app.shutdown())
-        
-        sys.exit(0)
-    
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+        _shutdown.set()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, request_shutdown, sig)
+        except NotImplementedError:
+            # Non-POSIX platforms (e.g. Windows): fall back to signal.signal
+            signal.signal(
+                sig,
+                lambda s, frame: loop.call_soon_threadsafe(request_shutdown, s),
+            )
 
 
 async def create_application() -> Application:
@@ -73,8 +120,15 @@ async def create_application() -> Application:
         logger.error(f"Configuration error: {e}")
         raise
     
-    # Create application
-    application = Application.builder().token(config.BOT_TOKEN).build()
+    # Create application. concurrent_updates lets handlers for different
+    # messages overlap; the default processes updates one at a time, which
+    # would serialize every async classification behind the previous one.
+    application = (
+        Application.builder()
+        .token(config.BOT_TOKEN)
+        .concurrent_updates(True)
+        .build()
+    )
     
     # Add message handler for all text messages
     application.add_handler(
@@ -87,7 +141,10 @@ async def create_application() -> Application:
     
     # Add error handler
     application.add_error_handler(handle_error)
-    
+
+    # Start coalescing concurrent classifications into batched LLM calls
+    batcher.start()
+
     logger.info("Bot application configured successfully")
     logger.info(f"Monitoring user: @{config.get_target_username_normalized()}")
     
@@ -135,10 +192,10 @@ async def main() -> None:
             connect_timeout=30, # 30 second connection timeout
         )
         
-        # Keep the bot running
-        while True:
-            await asyncio.sleep(1)
-            
+        # Idle with zero wakeups until a shutdown signal arrives
+        await _shutdown.wait()
+
+
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt, shutting down...")
     except Exception as e:
@@ -147,9 +204,23 @@ async def main() -> None:
     finally:
         if app:
             logger.info("Stopping bot...")
-            await app.stop()
+            # Application.stop() does not stop the updater, and
+            # Application.shutdown() raises RuntimeError while it runs
+            if app.updater and app.updater.running:
+                await app.updater.stop()
+            if app.running:
+                await app.stop()
+        # Close shared resources only once handlers have stopped, so no
+        # in-flight classification races a closed HTTP pool and no late
+        # cache entries land after the snapshot is written
+        await batcher.stop()
+        await aclose_http_client()
+        save_cache()
+        if app:
             await app.shutdown()
         logger.info("Bot stopped")
+        if log_listener:
+            log_listener.stop()
 
 
 def run_bot() -> NoReturn:
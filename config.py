@@ -45,12 +45,18 @@ class Config:
     
     # OpenAI Configuration
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+
+    # Maximum concurrent OpenAI calls before classifications queue locally
+    OPENAI_MAX_CONCURRENCY: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
     
     # Monitoring Configuration
     TARGET_USERNAME: str = os.getenv("TARGET_USERNAME", "parkerrralex")
     
     # Moderation Configuration
     MODERATION_PROFILE: str = os.getenv("MODERATION_PROFILE", "manipulative_coparent")
+
+    # Optional path for persisting cached moderation decisions across restarts
+    MODERATION_CACHE_PATH: str = os.getenv("MODERATION_CACHE_PATH", "")
     
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")